@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime
-import json
+import time
+import heapq
+from collections import Counter
+from operator import itemgetter
+import orjson
 
 # Page configuration
 st.set_page_config(
@@ -103,6 +103,18 @@ age_buckets = {
     "60+ (Golden Years)": list(range(60, 101))
 }
 
+# Precomputed age -> bucket lookup (ages are bounded to 0-100 by the input form), built once per
+# server process rather than on every script rerun
+@st.cache_resource
+def get_age_bucket_lookup():
+    lookup = ["Unknown"] * 101
+    for bucket, ages in age_buckets.items():
+        for a in ages:
+            lookup[a] = bucket
+    return lookup
+
+AGE_BUCKET_BY_AGE = get_age_bucket_lookup()
+
 # Event categories for better classification
 event_categories = [
     "🎓 Education & Learning",
@@ -119,29 +131,533 @@ event_categories = [
     "🤝 Social & Community"
 ]
 
+# Shared sentiment palette for the analytics charts
+SENTIMENT_COLORS = {
+    'Positive': '#2E8B57',
+    'Negative': '#DC143C',
+    'Neutral': '#4682B4',
+    'Mixed': '#DAA520'
+}
+SENTIMENT_SCALE = {"domain": list(SENTIMENT_COLORS), "range": list(SENTIMENT_COLORS.values())}
+
+# Pre-built Vega-Lite specs for the analytics charts; data is supplied at render time.
+# Grouping and binning are expressed as Vega-Lite aggregates so every chart shares one event table.
+SPECS = {
+    "timeline": {
+        "title": "Life Events Timeline",
+        "height": 500,
+        "mark": {"type": "circle", "opacity": 0.8},
+        "encoding": {
+            "x": {"field": "age", "type": "quantitative", "title": "Age"},
+            "y": {"field": "impact", "type": "quantitative", "title": "Emotional Impact (1-10)"},
+            "color": {
+                "field": "sentiment",
+                "type": "nominal",
+                "scale": SENTIMENT_SCALE
+            },
+            "size": {"field": "impact", "type": "quantitative"},
+            "tooltip": [
+                {"field": "title", "type": "nominal"},
+                {"field": "category", "type": "nominal"},
+                {"field": "life_area", "type": "nominal"},
+                {"field": "age", "type": "quantitative"},
+                {"field": "impact", "type": "quantitative"}
+            ]
+        }
+    },
+    "range": {
+        "title": "Event Distribution by Life Stage",
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "range", "type": "nominal", "title": "range", "axis": {"labelAngle": -45}},
+            "y": {"aggregate": "count", "type": "quantitative", "title": "count"},
+            "color": {
+                "field": "sentiment",
+                "type": "nominal",
+                "scale": SENTIMENT_SCALE
+            }
+        }
+    },
+    "areas": {
+        "title": "Average Impact by Life Area",
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "impact", "aggregate": "mean", "type": "quantitative"},
+            "y": {"field": "life_area", "type": "nominal", "sort": "-x", "title": None},
+            "color": {
+                "field": "impact",
+                "aggregate": "mean",
+                "type": "quantitative",
+                "scale": {"scheme": "redyellowgreen"}
+            }
+        }
+    },
+    "categories": {
+        "title": "Event Categories Distribution",
+        "mark": "arc",
+        "encoding": {
+            "theta": {"aggregate": "count", "type": "quantitative"},
+            "color": {"field": "category", "type": "nominal"},
+            "tooltip": [
+                {"field": "category", "type": "nominal"},
+                {"aggregate": "count", "type": "quantitative", "title": "count"}
+            ]
+        }
+    },
+    "impact": {
+        "title": "Impact Score Distribution",
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "impact", "type": "quantitative", "bin": {"maxbins": 10}},
+            "y": {"aggregate": "count", "type": "quantitative"},
+            "color": {"field": "sentiment", "type": "nominal"}
+        }
+    }
+}
+
+# Columns each chart references; only these are serialized to the browser for that chart
+SPEC_FIELDS = {
+    "timeline": ['age', 'impact', 'sentiment', 'title', 'category', 'life_area'],
+    "range": ['range', 'sentiment'],
+    "areas": ['life_area', 'impact'],
+    "categories": ['category'],
+    "impact": ['impact', 'sentiment']
+}
+
+# Compact dtypes for event frames: repeated string labels become categoricals (int codes) and
+# the small bounded ints (age 0-100, impact 1-10) are downcast to int8
+def apply_event_dtypes(df):
+    df['sentiment'] = pd.Categorical(df['sentiment'], categories=list(SENTIMENT_COLORS))
+    df['category'] = df['category'].astype('category')
+    df['life_area'] = df['life_area'].astype('category')
+    df['age'] = pd.to_numeric(df['age'], downcast='integer')
+    df['impact'] = pd.to_numeric(df['impact'], downcast='integer')
+    return df
+
+# All aggregates used by the Insights page (memoized per data change by get_insights())
+def compute_insights(df):
+    total = len(df)
+    # One pass per grouping column; every predicate below is read off these results
+    sentiment_counts = df['sentiment'].value_counts()
+    sentiment_impact = df.groupby('sentiment', observed=True)['impact'].mean()
+    # Life-area counts in one bincount over the categorical codes; argmax breaks ties alphabetically like mode()
+    life_areas = df['life_area'].cat.categories
+    area_codes = df['life_area'].cat.codes.to_numpy()
+    area_counts = np.bincount(area_codes[area_codes >= 0], minlength=len(life_areas))
+    top_area_code = area_counts.argmax()
+    # Five most recent events by age, also reused for the three most recent
+    recent_events = df.nlargest(5, 'age')
+
+    insights = {
+        "total": total,
+        "top_range": df.groupby('range')['impact'].mean().idxmax(),
+        "top_area": life_areas[top_area_code],
+        "top_area_count": int(area_counts[top_area_code]),
+        "life_area_count": int(np.count_nonzero(area_counts)),
+        "avg_negative_impact": sentiment_impact.get('Negative'),
+        "positive_ratio": sentiment_counts['Positive'] / total,
+        "high_impact_count": int((df['impact'] >= 8).sum()),
+        "recent_avg": None,
+        "early_avg": None,
+        "recent_negative_count": None,
+    }
+    if total >= 3:
+        insights["recent_avg"] = recent_events['impact'].head(3).mean()
+        insights["early_avg"] = df.nsmallest(3, 'age')['impact'].mean()
+    if total >= 5:
+        insights["recent_negative_count"] = int((recent_events['sentiment'] == 'Negative').sum())
+    return insights
+
+# Summary report body (everything below the timestamped header)
+def build_report(events):
+    # Reduce straight over the event columns - for a short summary this beats building a DataFrame.
+    # Missing values are skipped, as the pandas reductions this replaces did.
+    total = len(events['age'])
+    ages = [a for a in events['age'] if a is not None]
+    impacts = [i for i in events['impact'] if i is not None]
+    nan = float('nan')
+    sent_counts = Counter(s for s in events['sentiment'] if s is not None).most_common()
+    area_counts = Counter(a for a in events['life_area'] if a is not None).most_common(5)
+    top5 = heapq.nlargest(
+        5, (row for row in zip(events['age'], events['title'], events['impact']) if row[2] is not None),
+        key=itemgetter(2)
+    )
+    
+    sent_lines = "\n".join(f"{k}: {v}" for k, v in sent_counts)
+    area_lines = "\n".join(f"{k}: {v}" for k, v in area_counts)
+    top_lines = "\n".join(
+        [f"{'age':>3}  {'title':<30}  impact"] +
+        [f"{'-' if a is None else a:>3}  {str(t):<30}  {i:>6}" for a, t, i in top5]
+    )
+    
+    return f"""
+## Overview
+- Total Events: {total}
+- Age Range: {min(ages, default=nan):.0f} - {max(ages, default=nan):.0f} years
+- Average Impact: {sum(impacts) / len(impacts) if impacts else nan:.1f}/10
+
+## Sentiment Distribution
+{sent_lines}
+
+## Top Life Areas
+{area_lines}
+
+## Most Impactful Events
+{top_lines}
+"""
+
+# Life events are stored column-wise (dict of equal-length lists) so DataFrames wrap the lists
+# directly instead of walking one dict per event. Optional fields hold None for events without them.
+EVENT_FIELDS = [
+    "age", "title", "category", "description", "sentiment", "impact", "life_area",
+    "lessons_learned", "current_perspective", "timestamp", "range",
+    "duration", "people_involved", "location", "tags"
+]
+
+# Fields an imported event must carry; range and timestamp are filled in on import when missing
+REQUIRED_EVENT_FIELDS = frozenset(('age', 'impact', 'title', 'category', 'sentiment', 'life_area'))
+
+def is_int_in(value, low, high):
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= high
+
+# Check an imported event's required values and fill in its derived fields.
+# Returns None for events the analytics couldn't handle, so the caller can skip them.
+def normalize_imported_event(event):
+    if not isinstance(event, dict) or not REQUIRED_EVENT_FIELDS <= event.keys():
+        return None
+    if not (is_int_in(event['age'], 0, 100) and is_int_in(event['impact'], 1, 10)
+            and event['sentiment'] in SENTIMENT_COLORS
+            and all(isinstance(event[f], str) for f in ('title', 'category', 'life_area'))):
+        return None
+    
+    timestamp = event.get('timestamp')
+    # Older exports stored ISO timestamp strings; convert them to epoch seconds
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            return None
+    elif not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+        timestamp = time.time()
+    
+    age_range = event.get('range')
+    if not isinstance(age_range, str) or not age_range:
+        age_range = AGE_BUCKET_BY_AGE[event['age']]
+    
+    return {**event, 'timestamp': timestamp, 'range': age_range}
+
+def new_event_store():
+    return {f: [] for f in EVENT_FIELDS}
+
+def event_count():
+    return len(st.session_state.life_events["age"])
+
+# Append event dicts column by column; unknown keys (e.g. from imported files) become new columns
+def append_events(rows):
+    store = st.session_state.life_events
+    n = event_count()
+    for key in dict.fromkeys(k for row in rows for k in row):
+        if key not in store:
+            store[key] = [None] * n
+    # Slice-assign a fully built list so each column grows with a single resize, not per item
+    for key, column in store.items():
+        column[n:] = [row.get(key) for row in rows]
+
+def delete_event(idx):
+    for column in st.session_state.life_events.values():
+        column.pop(idx)
+
+# Row-wise view for JSON export, omitting unset optional fields
+def events_as_records():
+    store = st.session_state.life_events
+    return [{k: v for k, v in zip(store, values) if v is not None} for values in zip(*store.values())]
+
 # Initialize session state for data persistence
 if 'life_events' not in st.session_state:
-    st.session_state.life_events = []
+    st.session_state.life_events = new_event_store()
 if 'current_age' not in st.session_state:
     st.session_state.current_age = 25
+if 'events_df' not in st.session_state:
+    st.session_state.events_df = None
+if 'insights' not in st.session_state:
+    st.session_state.insights = None
+if 'report' not in st.session_state:
+    st.session_state.report = None
+
+# DataFrame view of life_events, built once per data change (events_changed() drops it)
+def get_events_df():
+    if st.session_state.events_df is None:
+        df = pd.DataFrame(st.session_state.life_events)
+        st.session_state.events_df = apply_event_dtypes(df) if len(df) else df
+    return st.session_state.events_df
+
+# Insights page aggregates, computed once per data change alongside the DataFrame view
+def get_insights():
+    if st.session_state.insights is None:
+        st.session_state.insights = compute_insights(get_events_df())
+    return st.session_state.insights
+
+# Call after any change to life_events: drops the DataFrame view and everything derived from it
+def events_changed():
+    st.session_state.events_df = None
+    st.session_state.insights = None
+    st.session_state.report = None
+
+# CSV export through pyarrow's vectorized writer; tag lists are joined since CSV cells are flat.
+# pyarrow's writers are imported here, on first export, rather than on every cold start.
+def events_to_csv(df):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    
+    if 'tags' in df:
+        df = df.assign(tags=df['tags'].map(lambda t: ", ".join(t) if isinstance(t, list) else t))
+    try:
+        buf = pa.BufferOutputStream()
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+        return buf.getvalue().to_pybytes()
+    except pa.ArrowException:
+        # Mixed-type columns from imported files can't map to an Arrow type; let pandas stringify them
+        return df.to_csv(index=False)
+
+# Columnar, compressed export; built from the events frame so every optional field becomes a column
+def events_to_parquet(df):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    buf = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue().to_pybytes()
+
+# Fragments rerun on their own widget changes, so sorting/filtering the event list or picking a
+# reflection prompt doesn't re-execute the rest of the page
+@st.fragment
+def render_event_table():
+    st.markdown("---")
+    st.subheader("📋 Your Life Events")
+    
+    # Event management
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_by = st.selectbox("Sort by:", ["age", "impact", "timestamp", "sentiment"])
+    with col2:
+        filter_sentiment = st.selectbox("Filter by sentiment:", ["All", "Positive", "Negative", "Neutral", "Mixed"])
+    with col3:
+        if st.button("🗑️ Clear All Events"):
+            st.session_state.life_events = new_event_store()
+            events_changed()
+            st.rerun()
+    
+    # Apply filters and sort on the event list directly, keeping each event's list position
+    events = st.session_state.life_events
+    display_positions = [i for i, sentiment in enumerate(events['sentiment'])
+                         if filter_sentiment == "All" or sentiment == filter_sentiment]
+    sort_column = events[sort_by]
+    # Events missing the sort field go last in either direction, as sort_values' NaN handling did
+    missing_positions = [i for i in display_positions if sort_column[i] is None]
+    display_positions = [i for i in display_positions if sort_column[i] is not None]
+    display_positions.sort(key=sort_column.__getitem__, reverse=sort_by != "age")
+    display_positions += missing_positions
+    display_events = {k: [column[i] for i in display_positions] for k, column in events.items()}
+    
+    # Display events in an interactive table
+    st.dataframe(
+        display_events,
+        use_container_width=True,
+        hide_index=True,
+        column_order=["age", "title", "sentiment", "impact", "category", "life_area", "range",
+                      "description", "lessons_learned", "current_perspective"],
+        column_config={
+            "age": st.column_config.NumberColumn("Age"),
+            "title": st.column_config.TextColumn("Event"),
+            "sentiment": st.column_config.TextColumn("Sentiment"),
+            "impact": st.column_config.ProgressColumn("Impact", min_value=1, max_value=10, format="%d/10"),
+            "category": st.column_config.TextColumn("Category"),
+            "life_area": st.column_config.TextColumn("Life Area"),
+            "range": st.column_config.TextColumn("Age Range"),
+            "description": st.column_config.TextColumn("Description"),
+            "lessons_learned": st.column_config.TextColumn("Lessons Learned"),
+            "current_perspective": st.column_config.TextColumn("Current Perspective")
+        }
+    )
+    
+    # Delete a single event
+    if display_positions:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            delete_idx = st.selectbox(
+                "Select an event to delete:",
+                display_positions,
+                format_func=lambda i: f"Age {events['age'][i]}: {events['title'][i]}"
+            )
+        with col2:
+            if st.button("🗑️ Delete Event", use_container_width=True):
+                delete_event(delete_idx)
+                events_changed()
+                st.rerun()
+
+@st.fragment
+def render_reflection_prompts():
+    prompts = [
+        "What patterns do you notice in your most impactful experiences?",
+        "How have your responses to challenges evolved over time?",
+        "What life areas deserve more attention in the coming year?",
+        "Which experiences taught you the most about yourself?",
+        "How can you create more positive, meaningful moments?"
+    ]
+    
+    selected_prompt = st.selectbox("Choose a reflection prompt:", prompts)
+    reflection_text = st.text_area("Your reflection:", height=150, placeholder="Take a moment to reflect on this question...")
+    
+    if st.button("💾 Save Reflection") and reflection_text:
+        # Add reflection as a special event
+        reflection_event = {
+            "age": st.session_state.current_age,
+            "title": "Personal Reflection",
+            "category": "🧠 Personal Growth",
+            "description": f"Prompt: {selected_prompt}\n\nReflection: {reflection_text}",
+            "sentiment": "Neutral",
+            "impact": 5,
+            "life_area": "Personal Growth",
+            "lessons_learned": "",
+            "current_perspective": "",
+            "timestamp": time.time(),
+            "range": AGE_BUCKET_BY_AGE[st.session_state.current_age]
+        }
+        append_events([reflection_event])
+        events_changed()
+        # Full rerun so the insights above pick up the new event; the flag carries the confirmation over
+        st.session_state.reflection_saved = True
+        st.rerun()
+    
+    if st.session_state.pop('reflection_saved', False):
+        st.success("✅ Reflection saved as a life event!")
+
+# Reset confirmation in a modal, so the destructive action is a single confirmed click
+@st.dialog("Confirm reset")
+def confirm_reset():
+    st.write("This will delete all your life events. This cannot be undone.")
+    if st.button("Yes, delete everything", type="primary"):
+        st.session_state.life_events = new_event_store()
+        events_changed()
+        st.rerun()
+
+# Export/import controls as a fragment: their buttons rerun only this section, not the page around it
+@st.fragment
+def render_data_management():
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📤 Export Data")
+        
+        if event_count():
+            # Export as JSON
+            if st.button("📄 Export as JSON"):
+                json_data = orjson.dumps(events_as_records(), option=orjson.OPT_INDENT_2)
+                st.download_button(
+                    label="Download JSON",
+                    data=json_data,
+                    file_name=f"life_map_{datetime.now().strftime('%Y%m%d')}.json",
+                    mime="application/json"
+                )
+            
+            # Export as CSV
+            if st.button("📊 Export as CSV"):
+                csv_data = events_to_csv(get_events_df())
+                st.download_button(
+                    label="Download CSV",
+                    data=csv_data,
+                    file_name=f"life_map_{datetime.now().strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
+            
+            # Export as Parquet
+            if st.button("🗃️ Export as Parquet"):
+                import pyarrow as pa
+                
+                try:
+                    parquet_data = events_to_parquet(get_events_df())
+                    st.download_button(
+                        label="Download Parquet",
+                        data=parquet_data,
+                        file_name=f"life_map_{datetime.now().strftime('%Y%m%d')}.parquet",
+                        mime="application/vnd.apache.parquet"
+                    )
+                except pa.ArrowException as e:
+                    st.error(f"Error exporting Parquet: {e}")
+            
+            # Summary report: built and UTF-8 encoded only on request and kept until the events
+            # change, so the download button survives reruns without re-formatting the report
+            if st.button("📋 Generate Summary Report"):
+                st.session_state.report = f"""
+# Life Map Summary Report
+Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+{build_report(st.session_state.life_events)}""".encode()
+            
+            if st.session_state.report is not None:
+                st.download_button(
+                    label="Download Report",
+                    data=st.session_state.report,
+                    file_name=f"life_map_report_{datetime.now().strftime('%Y%m%d')}.md",
+                    mime="text/markdown"
+                )
+        else:
+            st.info("No data to export. Add some life events first!")
+    
+    with col2:
+        st.subheader("📥 Import Data")
+        
+        uploaded_file = st.file_uploader("Upload JSON file", type=['json'])
+        if uploaded_file is not None:
+            try:
+                imported_data = orjson.loads(uploaded_file.getvalue())
+                if not isinstance(imported_data, list):
+                    st.error("Import file must contain a JSON list of events, as produced by Export as JSON")
+                elif st.button("Import Data"):
+                    # Drop malformed entries up front rather than letting them fail later in the analytics
+                    valid_events = [
+                        event for event in map(normalize_imported_event, imported_data)
+                        if event is not None
+                    ]
+                    skipped = len(imported_data) - len(valid_events)
+                    if valid_events:
+                        append_events(valid_events)
+                        events_changed()
+                    if skipped:
+                        st.warning(f"Skipped {skipped} events with missing or invalid required fields")
+                    st.success(f"✅ Imported {len(valid_events)} events!")
+                    if not skipped:
+                        st.rerun()
+            except Exception as e:
+                st.error(f"Error importing file: {e}")
+        
+        st.markdown("---")
+        st.subheader("🗑️ Data Management")
+        
+        if st.button("🔄 Reset All Data", type="secondary"):
+            confirm_reset()
 
 # Main content based on selected page
 if page == "📝 Life Events Input":
     st.markdown('<div class="section-header"><h2>📝 Life Events Input</h2></div>', unsafe_allow_html=True)
     
     # Quick stats
+    total_events = event_count()
+    good_events = bad_events = 0
+    if total_events:
+        df = get_events_df()
+        good_events = (df['sentiment'] == 'Positive').sum()
+        bad_events = (df['sentiment'] == 'Negative').sum()
+        avg_impact = df['impact'].fillna(5).mean()
+
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Events", len(st.session_state.life_events))
+        st.metric("Total Events", total_events)
     with col2:
-        good_events = len([e for e in st.session_state.life_events if e.get('sentiment') == 'Positive'])
         st.metric("Positive Events", good_events)
     with col3:
-        bad_events = len([e for e in st.session_state.life_events if e.get('sentiment') == 'Negative'])
         st.metric("Challenging Events", bad_events)
     with col4:
-        if st.session_state.life_events:
-            avg_impact = np.mean([e.get('impact', 5) for e in st.session_state.life_events])
+        if total_events:
             st.metric("Avg Impact", f"{avg_impact:.1f}/10")
     
     st.markdown("---")
@@ -207,8 +723,8 @@ if page == "📝 Life Events Input":
                 "life_area": life_area,
                 "lessons_learned": lessons_learned,
                 "current_perspective": current_perspective,
-                "timestamp": datetime.now().isoformat(),
-                "range": next((k for k, v in age_buckets.items() if event_age in v), "Unknown")
+                "timestamp": time.time(),
+                "range": AGE_BUCKET_BY_AGE[event_age]
             }
             
             if show_advanced:
@@ -219,62 +735,23 @@ if page == "📝 Life Events Input":
                     "tags": tags.split(",") if tags else []
                 })
             
-            st.session_state.life_events.append(new_event)
+            append_events([new_event])
+            events_changed()
             st.session_state.current_age = event_age
             st.success(f"✅ Event '{event_title}' added successfully!")
             st.rerun()
     
     # Display existing events
-    if st.session_state.life_events:
-        st.markdown("---")
-        st.subheader("📋 Your Life Events")
-        
-        # Create DataFrame for display
-        df = pd.DataFrame(st.session_state.life_events)
-        
-        # Event management
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            sort_by = st.selectbox("Sort by:", ["age", "impact", "timestamp", "sentiment"])
-        with col2:
-            filter_sentiment = st.selectbox("Filter by sentiment:", ["All", "Positive", "Negative", "Neutral", "Mixed"])
-        with col3:
-            if st.button("🗑️ Clear All Events"):
-                st.session_state.life_events = []
-                st.rerun()
-        
-        # Apply filters
-        display_df = df.copy()
-        if filter_sentiment != "All":
-            display_df = display_df[display_df['sentiment'] == filter_sentiment]
-        
-        display_df = display_df.sort_values(sort_by, ascending=True if sort_by == "age" else False)
-        
-        # Display events in an interactive table
-        for idx, event in display_df.iterrows():
-            with st.expander(f"Age {event['age']}: {event['title']} ({event['sentiment']}) - Impact: {event['impact']}/10"):
-                col1, col2 = st.columns([2, 1])
-                with col1:
-                    st.write(f"**Category:** {event['category']}")
-                    st.write(f"**Description:** {event['description']}")
-                    if event.get('lessons_learned'):
-                        st.write(f"**Lessons Learned:** {event['lessons_learned']}")
-                    if event.get('current_perspective'):
-                        st.write(f"**Current Perspective:** {event['current_perspective']}")
-                with col2:
-                    st.write(f"**Life Area:** {event['life_area']}")
-                    st.write(f"**Age Range:** {event['range']}")
-                    if st.button(f"🗑️ Delete", key=f"delete_{idx}"):
-                        st.session_state.life_events = [e for i, e in enumerate(st.session_state.life_events) if i != idx]
-                        st.rerun()
+    if event_count():
+        render_event_table()
 
 elif page == "📊 Visual Analytics":
     st.markdown('<div class="section-header"><h2>📊 Visual Analytics</h2></div>', unsafe_allow_html=True)
     
-    if not st.session_state.life_events:
+    if not event_count():
         st.warning("⚠️ No events to visualize. Please add some life events first!")
     else:
-        df = pd.DataFrame(st.session_state.life_events)
+        df = get_events_df()
         
         # Overview metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -296,81 +773,29 @@ elif page == "📊 Visual Analytics":
         st.subheader("🕒 Life Timeline")
         
         # Create timeline chart
-        fig_timeline = px.scatter(df, 
-                                x='age', 
-                                y='impact',
-                                color='sentiment',
-                                size='impact',
-                                hover_data=['title', 'category', 'life_area'],
-                                title="Life Events Timeline",
-                                color_discrete_map={
-                                    'Positive': '#2E8B57',
-                                    'Negative': '#DC143C', 
-                                    'Neutral': '#4682B4',
-                                    'Mixed': '#DAA520'
-                                })
-        
-        fig_timeline.update_layout(
-            xaxis_title="Age",
-            yaxis_title="Emotional Impact (1-10)",
-            height=500,
-            showlegend=True
-        )
-        
-        st.plotly_chart(fig_timeline, use_container_width=True)
-        
+        st.vega_lite_chart(df[SPEC_FIELDS["timeline"]], SPECS["timeline"], use_container_width=True)
+
         # Age range analysis
         col1, col2 = st.columns(2)
-        
+
         with col1:
             st.subheader("📊 Events by Age Range")
-            range_counts = df.groupby(['range', 'sentiment']).size().reset_index(name='count')
-            
-            fig_range = px.bar(range_counts, 
-                             x='range', 
-                             y='count',
-                             color='sentiment',
-                             title="Event Distribution by Life Stage",
-                             color_discrete_map={
-                                 'Positive': '#2E8B57',
-                                 'Negative': '#DC143C', 
-                                 'Neutral': '#4682B4',
-                                 'Mixed': '#DAA520'
-                             })
-            fig_range.update_xaxes(tickangle=45)
-            st.plotly_chart(fig_range, use_container_width=True)
-        
+            st.vega_lite_chart(df[SPEC_FIELDS["range"]], SPECS["range"], use_container_width=True)
+
         with col2:
             st.subheader("🎯 Life Areas Impact")
-            area_impact = df.groupby('life_area')['impact'].mean().sort_values(ascending=True)
-            
-            fig_areas = px.bar(x=area_impact.values, 
-                             y=area_impact.index,
-                             orientation='h',
-                             title="Average Impact by Life Area",
-                             color=area_impact.values,
-                             color_continuous_scale='RdYlGn')
-            st.plotly_chart(fig_areas, use_container_width=True)
-        
+            st.vega_lite_chart(df[SPEC_FIELDS["areas"]], SPECS["areas"], use_container_width=True)
+
         # Category analysis
         st.subheader("📈 Category Analysis")
         col1, col2 = st.columns(2)
-        
+
         with col1:
-            category_counts = df['category'].value_counts()
-            fig_cat = px.pie(values=category_counts.values, 
-                           names=category_counts.index,
-                           title="Event Categories Distribution")
-            st.plotly_chart(fig_cat, use_container_width=True)
-        
+            st.vega_lite_chart(df[SPEC_FIELDS["categories"]], SPECS["categories"], use_container_width=True)
+
         with col2:
             # Impact distribution
-            fig_impact = px.histogram(df, 
-                                    x='impact',
-                                    nbins=10,
-                                    title="Impact Score Distribution",
-                                    color='sentiment')
-            st.plotly_chart(fig_impact, use_container_width=True)
+            st.vega_lite_chart(df[SPEC_FIELDS["impact"]], SPECS["impact"], use_container_width=True)
         
         # Advanced analytics
         if show_advanced:
@@ -407,10 +832,10 @@ elif page == "📊 Visual Analytics":
 elif page == "🧠 Insights & Coaching":
     st.markdown('<div class="section-header"><h2>🧠 Insights & Coaching</h2></div>', unsafe_allow_html=True)
     
-    if not st.session_state.life_events:
+    if not event_count():
         st.warning("⚠️ No events to analyze. Please add some life events first!")
     else:
-        df = pd.DataFrame(st.session_state.life_events)
+        insights = get_insights()
         
         # Generate insights
         st.subheader("💡 Personal Insights")
@@ -423,23 +848,14 @@ elif page == "🧠 Insights & Coaching":
             st.write("**🔍 Life Patterns Detected:**")
             
             # Most impactful age range
-            range_impact = df.groupby('range')['impact'].mean().sort_values(ascending=False)
-            top_range = range_impact.index[0]
-            st.write(f"• **Most impactful period:** {top_range}")
+            st.write(f"• **Most impactful period:** {insights['top_range']}")
             
             # Dominant life area
-            top_area = df['life_area'].mode().iloc[0]
-            area_count = (df['life_area'] == top_area).sum()
-            st.write(f"• **Primary focus area:** {top_area} ({area_count} events)")
+            st.write(f"• **Primary focus area:** {insights['top_area']} ({insights['top_area_count']} events)")
             
             # Growth trajectory
-            if len(df) >= 3:
-                recent_events = df.nlargest(3, 'age')
-                recent_avg = recent_events['impact'].mean()
-                early_events = df.nsmallest(3, 'age')
-                early_avg = early_events['impact'].mean()
-                
-                if recent_avg > early_avg:
+            if insights['recent_avg'] is not None:
+                if insights['recent_avg'] > insights['early_avg']:
                     st.write("• **Growth trajectory:** Increasing impact over time ↗️")
                 else:
                     st.write("• **Growth trajectory:** Stabilizing experiences ➡️")
@@ -451,24 +867,20 @@ elif page == "🧠 Insights & Coaching":
             st.write("**🎯 Strengths & Opportunities:**")
             
             # Resilience indicator
-            negative_events = df[df['sentiment'] == 'Negative']
-            if len(negative_events) > 0:
-                avg_negative_impact = negative_events['impact'].mean()
-                if avg_negative_impact < 7:
+            if insights['avg_negative_impact'] is not None:
+                if insights['avg_negative_impact'] < 7:
                     st.write("• **Resilience:** Good at managing challenges")
                 else:
                     st.write("• **Growth area:** Building resilience strategies")
             
             # Positive event frequency
-            positive_ratio = (df['sentiment'] == 'Positive').mean()
-            if positive_ratio > 0.5:
+            if insights['positive_ratio'] > 0.5:
                 st.write("• **Strength:** Recognizing positive experiences")
             else:
                 st.write("• **Opportunity:** Focus on positive moments")
             
             # Life balance
-            life_areas = df['life_area'].nunique()
-            if life_areas >= 5:
+            if insights['life_area_count'] >= 5:
                 st.write("• **Balance:** Well-rounded life experiences")
             else:
                 st.write("• **Opportunity:** Explore diverse life areas")
@@ -482,8 +894,7 @@ elif page == "🧠 Insights & Coaching":
         recommendations = []
         
         # Based on sentiment balance
-        positive_ratio = (df['sentiment'] == 'Positive').mean()
-        if positive_ratio < 0.4:
+        if insights['positive_ratio'] < 0.4:
             recommendations.append({
                 "area": "Mindset & Perspective",
                 "recommendation": "Practice gratitude journaling to identify more positive moments in your daily life.",
@@ -491,8 +902,7 @@ elif page == "🧠 Insights & Coaching":
             })
         
         # Based on impact patterns
-        high_impact_events = df[df['impact'] >= 8]
-        if len(high_impact_events) < len(df) * 0.3:
+        if insights['high_impact_count'] < insights['total'] * 0.3:
             recommendations.append({
                 "area": "Goal Setting",
                 "recommendation": "Set more ambitious goals to create meaningful, high-impact experiences.",
@@ -500,23 +910,20 @@ elif page == "🧠 Insights & Coaching":
             })
         
         # Based on life areas
-        life_area_counts = df['life_area'].value_counts()
-        if life_area_counts.iloc[0] > len(df) * 0.5:
+        if insights['top_area_count'] > insights['total'] * 0.5:
             recommendations.append({
                 "area": "Life Balance",
-                "recommendation": f"You're heavily focused on {life_area_counts.index[0]}. Consider diversifying your experiences.",
+                "recommendation": f"You're heavily focused on {insights['top_area']}. Consider diversifying your experiences.",
                 "action": "Plan one activity in a different life area this month."
             })
         
         # Based on recent events
-        if len(df) >= 5:
-            recent_events = df.nlargest(5, 'age')
-            if (recent_events['sentiment'] == 'Negative').sum() >= 3:
-                recommendations.append({
-                    "area": "Stress Management",
-                    "recommendation": "Recent events show some challenges. Focus on stress management and self-care.",
-                    "action": "Implement a daily 10-minute mindfulness or relaxation practice."
-                })
+        if insights['recent_negative_count'] is not None and insights['recent_negative_count'] >= 3:
+            recommendations.append({
+                "area": "Stress Management",
+                "recommendation": "Recent events show some challenges. Focus on stress management and self-care.",
+                "action": "Implement a daily 10-minute mindfulness or relaxation practice."
+            })
         
         # Display recommendations
         for i, rec in enumerate(recommendations, 1):
@@ -530,42 +937,15 @@ elif page == "🧠 Insights & Coaching":
         st.markdown("---")
         st.subheader("🤔 Reflection Prompts")
         
-        prompts = [
-            "What patterns do you notice in your most impactful experiences?",
-            "How have your responses to challenges evolved over time?",
-            "What life areas deserve more attention in the coming year?",
-            "Which experiences taught you the most about yourself?",
-            "How can you create more positive, meaningful moments?"
-        ]
-        
-        selected_prompt = st.selectbox("Choose a reflection prompt:", prompts)
-        reflection_text = st.text_area("Your reflection:", height=150, placeholder="Take a moment to reflect on this question...")
-        
-        if st.button("💾 Save Reflection") and reflection_text:
-            # Add reflection as a special event
-            reflection_event = {
-                "age": st.session_state.current_age,
-                "title": "Personal Reflection",
-                "category": "🧠 Personal Growth",
-                "description": f"Prompt: {selected_prompt}\n\nReflection: {reflection_text}",
-                "sentiment": "Neutral",
-                "impact": 5,
-                "life_area": "Personal Growth",
-                "lessons_learned": "",
-                "current_perspective": "",
-                "timestamp": datetime.now().isoformat(),
-                "range": next((k for k, v in age_buckets.items() if st.session_state.current_age in v), "Unknown")
-            }
-            st.session_state.life_events.append(reflection_event)
-            st.success("✅ Reflection saved as a life event!")
+        render_reflection_prompts()
 
 elif page == "📈 Progress Tracking":
     st.markdown('<div class="section-header"><h2>📈 Progress Tracking</h2></div>', unsafe_allow_html=True)
     
-    if not st.session_state.life_events:
+    if not event_count():
         st.warning("⚠️ No events to track. Please add some life events first!")
     else:
-        df = pd.DataFrame(st.session_state.life_events)
+        df = get_events_df()
         
         # Progress metrics
         st.subheader("📊 Your Journey Metrics")
@@ -582,13 +962,13 @@ elif page == "📈 Progress Tracking":
                 st.metric("Journey Completion", f"{completion_score:.0f}%")
         
         with col3:
-            reflection_events = len([e for e in st.session_state.life_events if "reflection" in e.get('title', '').lower()])
+            reflection_events = sum("reflection" in (t or '').lower() for t in st.session_state.life_events['title'])
             st.metric("Reflections Added", reflection_events)
         
         with col4:
             if len(df) >= 2:
-                df_sorted = df.sort_values('timestamp')
-                days_active = (pd.to_datetime(df_sorted.iloc[-1]['timestamp']) - pd.to_datetime(df_sorted.iloc[0]['timestamp'])).days + 1
+                # Timestamps are epoch seconds
+                days_active = int((df['timestamp'].max() - df['timestamp'].min()) / 86400) + 1
                 st.metric("Days Active", days_active)
         
         # Growth tracking
@@ -601,25 +981,30 @@ elif page == "📈 Progress Tracking":
             
             # Calculate moving average of impact
             window_size = min(3, len(df_sorted))
-            df_sorted['impact_ma'] = df_sorted['impact'].rolling(window=window_size, center=True).mean()
+            df_sorted['impact_ma'] = df_sorted['impact'].astype('float32').rolling(window=window_size, center=True).mean()
+            
+            # Plotly is only needed here, so import it lazily to keep other pages' cold start light
+            import plotly.graph_objects as go
             
             fig_growth = go.Figure()
             
-            # Add individual events
-            fig_growth.add_trace(go.Scatter(
-                x=df_sorted['age'],
-                y=df_sorted['impact'],
+            ages = df_sorted['age'].to_numpy()
+            
+            # Add individual events (WebGL scatter, fed numpy arrays so Plotly can emit typed arrays)
+            fig_growth.add_trace(go.Scattergl(
+                x=ages,
+                y=df_sorted['impact'].to_numpy(),
                 mode='markers',
                 name='Individual Events',
                 marker=dict(size=8, opacity=0.6),
-                text=df_sorted['title'],
+                text=df_sorted['title'].to_numpy(),
                 hovertemplate='<b>%{text}</b><br>Age: %{x}<br>Impact: %{y}<extra></extra>'
             ))
             
             # Add trend line
             fig_growth.add_trace(go.Scatter(
-                x=df_sorted['age'],
-                y=df_sorted['impact_ma'],
+                x=ages,
+                y=df_sorted['impact_ma'].to_numpy(),
                 mode='lines',
                 name='Growth Trend',
                 line=dict(width=3, color='red')
@@ -694,87 +1079,7 @@ elif page == "📈 Progress Tracking":
 elif page == "💾 Data Management":
     st.markdown('<div class="section-header"><h2>💾 Data Management</h2></div>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("📤 Export Data")
-        
-        if st.session_state.life_events:
-            # Export as JSON
-            if st.button("📄 Export as JSON"):
-                json_data = json.dumps(st.session_state.life_events, indent=2)
-                st.download_button(
-                    label="Download JSON",
-                    data=json_data,
-                    file_name=f"life_map_{datetime.now().strftime('%Y%m%d')}.json",
-                    mime="application/json"
-                )
-            
-            # Export as CSV
-            if st.button("📊 Export as CSV"):
-                df = pd.DataFrame(st.session_state.life_events)
-                csv_data = df.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv_data,
-                    file_name=f"life_map_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
-                )
-            
-            # Summary report
-            if st.button("📋 Generate Summary Report"):
-                df = pd.DataFrame(st.session_state.life_events)
-                
-                report = f"""
-# Life Map Summary Report
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-
-## Overview
-- Total Events: {len(df)}
-- Age Range: {df['age'].min()} - {df['age'].max()} years
-- Average Impact: {df['impact'].mean():.1f}/10
-
-## Sentiment Distribution
-{df['sentiment'].value_counts().to_string()}
-
-## Top Life Areas
-{df['life_area'].value_counts().head().to_string()}
-
-## Most Impactful Events
-{df.nlargest(5, 'impact')[['age', 'title', 'impact']].to_string(index=False)}
-                """
-                
-                st.download_button(
-                    label="Download Report",
-                    data=report,
-                    file_name=f"life_map_report_{datetime.now().strftime('%Y%m%d')}.md",
-                    mime="text/markdown"
-                )
-        else:
-            st.info("No data to export. Add some life events first!")
-    
-    with col2:
-        st.subheader("📥 Import Data")
-        
-        uploaded_file = st.file_uploader("Upload JSON file", type=['json'])
-        if uploaded_file is not None:
-            try:
-                imported_data = json.load(uploaded_file)
-                if st.button("Import Data"):
-                    st.session_state.life_events.extend(imported_data)
-                    st.success(f"✅ Imported {len(imported_data)} events!")
-                    st.rerun()
-            except Exception as e:
-                st.error(f"Error importing file: {e}")
-        
-        st.markdown("---")
-        st.subheader("🗑️ Data Management")
-        
-        if st.button("🔄 Reset All Data", type="secondary"):
-            if st.checkbox("I understand this will delete all my data"):
-                st.session_state.life_events = []
-                st.success("All data cleared!")
-                st.rerun()
+    render_data_management()
 
 # Footer
 st.markdown("---")